@@ -3,8 +3,22 @@ import random
 import sys
 import os
 import math
+import json
+import hashlib
+import mmap
+import struct
+import threading
+import time
+import asyncio
+import heapq
+from array import array  # Packed fish genomes for the tank population
 import pickle  # For saving and loading game data
 
+# Soak tests run on servers without a display or sound card
+if __name__ == "__main__" and "--sessions" in sys.argv:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 # Initialize pygame
 pygame.init()
 pygame.mixer.init()  # Initialize the mixer module for audio
@@ -24,21 +38,180 @@ BLACK = (0, 0, 0)
 font = pygame.font.SysFont(None, 36)
 small_font = pygame.font.SysFont(None, 24)
 
-# Load the generic fish image
-fish_base_image = pygame.image.load(os.path.join('images', 'fish.png')).convert_alpha()
-fish_base_image = pygame.transform.scale(fish_base_image, (60, 30))
-
-# Load gold coin image
-coin_image = pygame.image.load(os.path.join('images', 'gold_coin.png')).convert_alpha()
-coin_image = pygame.transform.scale(coin_image, (30, 30))
+# Images to bake: name -> (source file, size, has transparency)
+ASSET_SOURCES = {
+    "fish": (os.path.join('images', 'fish.png'), (60, 30), True),
+    "coin": (os.path.join('images', 'gold_coin.png'), (30, 30), True),
+    "world_map": (os.path.join('images', 'main_menu.png'), (220, 220), False),
+    "hat": (os.path.join('images', 'hat.png'), (30, 30), True),
+    # Background images for each area, scaled to fit the screen
+    "Pond": (os.path.join('images', 'pond.png'), (WIDTH, HEIGHT), False),
+    "Lake": (os.path.join('images', 'lake.png'), (WIDTH, HEIGHT), False),
+    "Stream": (os.path.join('images', 'stream.png'), (WIDTH, HEIGHT), False),
+    "River": (os.path.join('images', 'river.png'), (WIDTH, HEIGHT), False),
+    "Ocean": (os.path.join('images', 'ocean.png'), (WIDTH, HEIGHT), False),
+    "Tank": (os.path.join('images', 'tank.png'), (WIDTH, HEIGHT), False),
+}
+AREA_BACKGROUNDS = ["Pond", "Lake", "Stream", "River", "Ocean", "Tank"]
 
-# Load world map image
-world_map_image = pygame.image.load(os.path.join('images', 'main_menu.png')).convert()
-world_map_image = pygame.transform.scale(world_map_image, (220, 220))
+# Sounds
+background_music_path = os.path.join('images', 'sounds', 'background_music.mp3')
+coin_sound_path = os.path.join('images', 'sounds', 'coin_sound.mp3')
 
-# Load cosmetic items (e.g., hats)
-hat_image = pygame.image.load(os.path.join('images', 'hat.png')).convert_alpha()
-hat_image = pygame.transform.scale(hat_image, (30, 30))
+# Pre-baked images and sounds, rebuilt whenever a source file or the resolution changes
+ASSET_BUNDLE_PATH = 'assets.bundle'
+ASSET_BUNDLE_MAGIC = b'PHISHBND'
+
+
+def asset_bundle_key():
+    """Hash of every baked source file plus the settings the bake depends on."""
+    digest = hashlib.sha256()
+    display_format = (screen.get_bitsize(), screen.get_masks())
+    digest.update(repr((WIDTH, HEIGHT, display_format, pygame.mixer.get_init())).encode())
+    for path in [source[0] for source in ASSET_SOURCES.values()] + [coin_sound_path]:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def decode_assets():
+    """Decode and scale every asset from its source file."""
+    assets = {}
+    for name, (path, size, alpha) in ASSET_SOURCES.items():
+        image = pygame.image.load(path)
+        image = image.convert_alpha() if alpha else image.convert()
+        assets[name] = pygame.transform.scale(image, size)
+    assets["coin_sound"] = pygame.mixer.Sound(coin_sound_path)
+    return assets
+
+
+def bake_assets(key, assets):
+    """Write decoded assets to the bundle file."""
+    entries = {}
+    blobs = []
+    offset = 0
+    for name, (path, size, alpha) in ASSET_SOURCES.items():
+        image = assets[name]
+        # Store the surface's own display-format pixels so loading is a plain copy
+        data = image.get_buffer().raw
+        entries[name] = {"offset": offset, "length": len(data), "size": size,
+                         "depth": image.get_bitsize(), "masks": image.get_masks(), "pitch": image.get_pitch()}
+        blobs.append(data)
+        offset += len(data)
+
+    # Store the decoded PCM so the MP3 never has to be decoded again
+    data = assets["coin_sound"].get_raw()
+    entries["coin_sound"] = {"offset": offset, "length": len(data)}
+    blobs.append(data)
+
+    header = json.dumps({"key": key, "entries": entries}).encode()
+    # Write to a temporary file first so a crash never leaves a half-written bundle
+    temp_path = ASSET_BUNDLE_PATH + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(ASSET_BUNDLE_MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for data in blobs:
+                f.write(data)
+        os.replace(temp_path, ASSET_BUNDLE_PATH)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def bundle_data_length(header):
+    """Bytes of data the header's entries need, or None if the header is malformed."""
+    if not isinstance(header, dict) or not isinstance(header.get("entries"), dict):
+        return None
+    entries = header["entries"]
+    if any(name not in entries for name in list(ASSET_SOURCES) + ["coin_sound"]):
+        return None
+    data_length = 0
+    for entry in entries.values():
+        if not isinstance(entry, dict) or not isinstance(entry.get("offset"), int) \
+                or not isinstance(entry.get("length"), int):
+            return None
+        data_length = max(data_length, entry["offset"] + entry["length"])
+    return data_length
+
+
+def read_asset_bundle(key):
+    """Memory-map the bundle and return (header, data), or None if it is missing, stale or damaged."""
+    prefix = len(ASSET_BUNDLE_MAGIC)
+    if not os.path.exists(ASSET_BUNDLE_PATH) or os.path.getsize(ASSET_BUNDLE_PATH) < prefix + 4:
+        return None
+    with open(ASSET_BUNDLE_PATH, 'rb') as f:
+        bundle = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if bundle[:prefix] == ASSET_BUNDLE_MAGIC:
+        header_length, = struct.unpack('<I', bundle[prefix:prefix + 4])
+        data_start = prefix + 4 + header_length
+        try:
+            header = json.loads(bundle[prefix + 4:data_start])
+        except ValueError:
+            header = None
+        data_length = bundle_data_length(header)
+        # A truncated data section means the bundle has to be baked again
+        if data_length is not None and header.get("key") == key and len(bundle) - data_start >= data_length:
+            return header, memoryview(bundle)[data_start:]
+    # Release the file so it can be baked again
+    bundle.close()
+    return None
+
+
+def load_assets():
+    """Load images and the coin sound from the bundle, baking it first if needed."""
+    key = asset_bundle_key()
+    bundle = read_asset_bundle(key)
+    if bundle is None:
+        assets = decode_assets()
+        try:
+            bake_assets(key, assets)
+        except OSError as error:
+            # Read-only install or full disk: play with the decoded assets
+            print(f"Could not write {ASSET_BUNDLE_PATH}: {error}", file=sys.stderr)
+            return assets
+        bundle = read_asset_bundle(key)
+        if bundle is None:
+            return assets
+    header, data = bundle
+
+    assets = {}
+    for name, (path, size, alpha) in ASSET_SOURCES.items():
+        entry = header["entries"][name]
+        pixels = data[entry["offset"]:entry["offset"] + entry["length"]]
+        image = pygame.Surface(tuple(entry["size"]), pygame.SRCALPHA if alpha else 0,
+                               entry["depth"], tuple(entry["masks"]))
+        # The pixels are already in display format, so they are copied straight in
+        buffer = image.get_buffer()
+        if image.get_pitch() == entry["pitch"]:
+            buffer.write(bytes(pixels))
+        else:
+            # Rows are padded differently here, so copy one row at a time
+            row_bytes = entry["size"][0] * entry["depth"] // 8
+            for y in range(entry["size"][1]):
+                row = pixels[y * entry["pitch"]:y * entry["pitch"] + row_bytes]
+                buffer.write(bytes(row), y * image.get_pitch())
+        del buffer  # Unlock the surface
+        assets[name] = image
+    entry = header["entries"]["coin_sound"]
+    assets["coin_sound"] = pygame.mixer.Sound(buffer=data[entry["offset"]:entry["offset"] + entry["length"]])
+    return assets
+
+
+# Bake the asset bundle and exit (python phish.py --bake)
+if __name__ == "__main__" and "--bake" in sys.argv:
+    bake_assets(asset_bundle_key(), decode_assets())
+    pygame.quit()
+    sys.exit()
+
+assets = load_assets()
+
+# Generic fish, gold coin, world map and cosmetic item (e.g., hat) images
+fish_base_image = assets["fish"]
+coin_image = assets["coin"]
+world_map_image = assets["world_map"]
+hat_image = assets["hat"]
 
 def colorize(image, new_color):
     """Colorize an image while preserving its transparency."""
@@ -49,30 +222,231 @@ def colorize(image, new_color):
     image.fill(new_color[0:3] + (0,), None, pygame.BLEND_RGBA_ADD)
     return image
 
-# Load background images for each area
-background_images = {
-    "Pond": pygame.image.load(os.path.join('images', 'pond.png')).convert(),
-    "Lake": pygame.image.load(os.path.join('images', 'lake.png')).convert(),
-    "Stream": pygame.image.load(os.path.join('images', 'stream.png')).convert(),
-    "River": pygame.image.load(os.path.join('images', 'river.png')).convert(),
-    "Ocean": pygame.image.load(os.path.join('images', 'ocean.png')).convert(),
-    "Tank": pygame.image.load(os.path.join('images', 'tank.png')).convert(),  # Add Tank background
-}
-
-# Scale background images to fit the screen
-for key in background_images:
-    background_images[key] = pygame.transform.scale(background_images[key], (WIDTH, HEIGHT))
-
-# Load sounds
-background_music_path = os.path.join('images', 'sounds', 'background_music.mp3')
-coin_sound_path = os.path.join('images', 'sounds', 'coin_sound.mp3')
-
-# Load background music
-pygame.mixer.music.load(background_music_path)
-pygame.mixer.music.play(-1)  # Play indefinitely
+# Background images for each area
+background_images = {area: assets[area] for area in AREA_BACKGROUNDS}
+
+# Coin sound effect
+coin_sound = assets["coin_sound"]
+
+# Telemetry event types
+EVENT_COLLECT = "collect"
+EVENT_STORE = "store"
+EVENT_SELL = "sell"
+EVENT_UPGRADE = "upgrade"
+EVENT_UNLOCK = "unlock"
+EVENT_BREED = "breed"
+EVENT_AREA_CHANGE = "area_change"
+EVENT_FRAME_HITCH = "frame_hitch"
+EVENT_BUDGET_OVERRUN = "budget_overrun"
+
+# Define Telemetry class
+class Telemetry:
+    """Structured game event stream.
+
+    Events go into a preallocated ring buffer on the game thread and a
+    background thread writes them out in batches to rotating JSONL files.
+    If the writer falls behind, new events are dropped and counted.
+    """
+
+    def __init__(self, path, capacity=4096, sample_rate=1.0, flush_interval=1.0,
+                 max_file_bytes=5 * 1024 * 1024, max_files=5):
+        self.path = path
+        self.capacity = capacity
+        self.sample_rate = sample_rate  # Fraction of events kept, 0.0 to 1.0
+        self.flush_interval = flush_interval  # Seconds between writes
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.buffer = [None] * capacity
+        self.head = 0  # Total events written into the buffer
+        self.tail = 0  # Total events taken out by the writer
+        self.dropped = 0  # Total events dropped, only ever increased by emit()
+        self.dropped_reported = 0  # Drops already written out by the writer
+        self.lost = 0  # Events lost to failed writes, reported on the next good write
+        self.rng = random.Random()  # Keeps sampling off the game's RNG
+        self.stop_event = threading.Event()
+        self.writer = None
+
+    def emit(self, kind, value=0, **fields):
+        # Hot path: one tuple into a preallocated slot, no I/O
+        if self.sample_rate < 1.0 and self.rng.random() >= self.sample_rate:
+            return
+        if self.head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        self.buffer[self.head % self.capacity] = (time.time(), kind, value, fields)
+        self.head += 1
+
+    def start(self):
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_loop, daemon=True)
+            self.writer.start()
+
+    def close(self):
+        # Stop the writer and flush whatever is left
+        if self.writer is not None:
+            self.stop_event.set()
+            self.writer.join()
+            self.writer = None
+        self.flush()
+
+    def write_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        head = self.head
+        if head == self.tail:
+            return
+        tail = self.tail
+        lines = []
+        for i in range(tail, head):
+            slot = i % self.capacity
+            timestamp, kind, value, fields = self.buffer[slot]
+            self.buffer[slot] = None
+            lines.append(json.dumps({"t": timestamp, "event": kind, "value": value, **fields}))
+        self.tail = head
+        # Only the game thread writes `dropped`; the writer just remembers what it reported
+        dropped = self.dropped
+        if dropped != self.dropped_reported:
+            lines.append(json.dumps({"t": time.time(), "event": "dropped",
+                                     "value": dropped - self.dropped_reported}))
+            self.dropped_reported = dropped
+        if self.lost:
+            lines.append(json.dumps({"t": time.time(), "event": "write_failed", "value": self.lost}))
+        try:
+            self.rotate()
+            with open(self.path, 'a') as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as error:
+            # Keep the writer alive; the batch is lost but counted
+            self.lost += head - tail
+            print(f"Telemetry write failed, {self.lost} events lost so far: {error}", file=sys.stderr)
+        else:
+            self.lost = 0
+
+    def rotate(self):
+        # Shift events.jsonl -> events.jsonl.1 -> ... once the file gets too big
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            return
+        if os.path.getsize(self.path) < self.max_file_bytes:
+            return
+        for i in range(self.max_files - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+# Game event stream
+# Set PHISH_TELEMETRY_SAMPLE_RATE (0.0 to 1.0) to keep only a fraction of events
+telemetry = Telemetry(os.path.join('telemetry', 'events.jsonl'),
+                      sample_rate=float(os.environ.get('PHISH_TELEMETRY_SAMPLE_RATE', '1.0')))
+
+# Job priorities (lower runs first)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Define JobScheduler class
+class JobScheduler:
+    """Spreads expensive work over several frames within a per-frame time budget.
+
+    A job is a generator that does one small slice of work per `next()`.
+    Each frame, jobs run slice by slice in priority order until the budget
+    is spent, so lower priority jobs wait for frames with time to spare.
+    With `slices_per_frame` set, each frame runs that many slices instead,
+    so the work done per frame doesn't depend on the wall clock.
+    """
+
+    def __init__(self, budget_ms=4.0, tolerance=0.25, slices_per_frame=None):
+        self.budget_ms = budget_ms
+        self.slices_per_frame = slices_per_frame
+        self.tolerance = tolerance  # Fraction of the budget a frame may go over
+        self.jobs = []  # Heap of (priority, order added, job)
+        self.added = 0
+        self.slice_ms = 0.0  # Running average cost of one slice
+        self.overran = False  # Whether the last frame overran
+        self.overruns = 0  # Frames where a slice or the frame went over budget
+
+    def add(self, job, priority=PRIORITY_NORMAL):
+        heapq.heappush(self.jobs, (priority, self.added, job))
+        self.added += 1
+        return job
+
+    def cancel(self, job):
+        self.jobs = [entry for entry in self.jobs if entry[2] is not job]
+        heapq.heapify(self.jobs)
+        job.close()
+
+    def pending(self, job):
+        return any(entry[2] is job for entry in self.jobs)
+
+    def queue_depth(self):
+        return len(self.jobs)
 
-# Load coin sound effect
-coin_sound = pygame.mixer.Sound(coin_sound_path)
+    def run(self):
+        """Run job slices while the budget has room. Returns the time taken in ms."""
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        self.overran = False
+        slices = 0
+        while self.jobs:
+            slice_start = time.perf_counter()
+            if self.slices_per_frame is not None:
+                if slices >= self.slices_per_frame:
+                    break
+            # Always run one slice so jobs make progress, then only start
+            # slices that should still fit in what is left of the budget
+            elif slices and slice_start + self.slice_ms / 1000 > deadline:
+                break
+            job = self.jobs[0][2]
+            try:
+                next(job)
+            except StopIteration:
+                heapq.heappop(self.jobs)
+            slice_ms = (time.perf_counter() - slice_start) * 1000
+            self.slice_ms += 0.2 * (slice_ms - self.slice_ms)
+            if slice_ms > self.budget_ms:
+                self.overran = True  # One slice alone blew the budget
+            slices += 1
+        elapsed = (time.perf_counter() - start) * 1000
+        if elapsed > self.budget_ms * (1 + self.tolerance):
+            self.overran = True
+        if self.overran:
+            self.overruns += 1
+        return elapsed
+
+# Define GameContext class
+class GameContext:
+    """Everything a game session needs from the outside world.
+
+    Images and fonts are shared read-only between sessions; the render
+    target, sound, RNG, clock, save file and telemetry session id belong
+    to one session. A screen of None runs the session headless.
+    """
+
+    def __init__(self, screen=None, rng=None, get_ticks=None, save_path='savegame.pkl',
+                 telemetry=None, session_id=None, sounds=True):
+        self.screen = screen
+        self.font = font
+        self.small_font = small_font
+        self.background_images = background_images
+        self.coin_sound = coin_sound if sounds else None
+        self.rng = rng if rng is not None else random.Random()
+        self.get_ticks = get_ticks if get_ticks is not None else pygame.time.get_ticks
+        self.save_path = save_path
+        self.telemetry = telemetry
+        self.session_id = session_id
+
+    def emit(self, kind, value=0, **fields):
+        if self.telemetry is not None:
+            if self.session_id is not None:
+                fields["session"] = self.session_id
+            self.telemetry.emit(kind, value, **fields)
+
+    def play_coin_sound(self):
+        if self.coin_sound is not None:
+            self.coin_sound.play()
 
 # Fish base values based on pattern
 fish_base_values = {
@@ -83,6 +457,128 @@ fish_base_values = {
     "rainbow": 5,
 }
 
+# Fish colors and patterns, indexed by the genome
+FISH_PATTERNS = list(fish_base_values.keys())
+FISH_COLORS = [
+    pygame.Color("red"), pygame.Color("green"), pygame.Color("blue"),
+    pygame.Color("orange"), pygame.Color("pink"), pygame.Color("cyan"),
+    pygame.Color("magenta"), pygame.Color("brown"), pygame.Color("gray"),
+    pygame.Color("yellow"), pygame.Color("purple")
+]
+
+# Cosmetic slots a genome can carry (one bit per cosmetic)
+COSMETIC_SLOTS = ["Hat"]
+cosmetic_images = {"Hat": hat_image}
+
+# Genome layout: gene name -> (bit offset, bit width)
+GENE_LAYOUT = {
+    "color": (0, 4),
+    "pattern": (4, 3),
+    "size": (7, 3),
+    "cosmetics": (10, 4),
+    "speed": (14, 3),
+    "rarity": (17, 3),
+}
+
+# Number of valid values for each gene
+GENE_CHOICES = {
+    "color": len(FISH_COLORS),
+    "pattern": len(FISH_PATTERNS),
+    "size": 8,
+    "cosmetics": 1 << len(COSMETIC_SLOTS),
+    "speed": 8,
+    "rarity": 8,
+}
+
+# Chance for each gene to mutate when a baby is born
+MUTATION_RATES = {
+    "color": 0.05,
+    "pattern": 0.02,
+    "size": 0.05,
+    "cosmetics": 0.0,
+    "speed": 0.05,
+    "rarity": 0.01,
+}
+
+# Gene values for wild fish (size 3 and speed 4 match the original fish)
+WILD_GENES = {"size": 3, "cosmetics": 0, "speed": 4, "rarity": 0}
+
+# Most tank fish that get a sprite; the rest only live as genomes
+TANK_VISIBLE_FISH = 60
+
+
+def get_gene(genome, gene):
+    offset, width = GENE_LAYOUT[gene]
+    return (genome >> offset) & ((1 << width) - 1)
+
+
+def set_gene(genome, gene, value):
+    offset, width = GENE_LAYOUT[gene]
+    mask = ((1 << width) - 1) << offset
+    return (genome & ~mask) | ((value << offset) & mask)
+
+
+def pack_genome(**genes):
+    """Pack gene values into a single integer genome."""
+    genome = 0
+    for gene, value in genes.items():
+        genome = set_gene(genome, gene, value)
+    return genome
+
+
+def genome_value(genome):
+    """Base value of a fish with this genome (pattern value scaled by rarity)."""
+    pattern = FISH_PATTERNS[get_gene(genome, "pattern")]
+    return fish_base_values[pattern] * (1 + get_gene(genome, "rarity"))
+
+
+def breed_generation(genomes, count, rng=random):
+    """Breed `count` offspring from random pairs of `genomes`.
+
+    Each gene is taken from either parent in one mask operation, then
+    mutated according to MUTATION_RATES. Returns an array of new genomes.
+    """
+    offspring = array('Q')
+    size = len(genomes)
+    if size < 2:
+        return offspring
+    for _ in range(count):
+        i = rng.randrange(size)
+        j = rng.randrange(size - 1)
+        if j >= i:
+            j += 1
+        # Pick whole genes from the first parent wherever the mask is set
+        mask = 0
+        for offset, width in GENE_LAYOUT.values():
+            if rng.random() < 0.5:
+                mask |= ((1 << width) - 1) << offset
+        child = (genomes[i] & mask) | (genomes[j] & ~mask)
+        for gene, rate in MUTATION_RATES.items():
+            if rate and rng.random() < rate:
+                if gene == "rarity":
+                    # Rarity only ever climbs one step at a time
+                    value = min(get_gene(child, gene) + 1, GENE_CHOICES[gene] - 1)
+                else:
+                    value = rng.randrange(GENE_CHOICES[gene])
+                child = set_gene(child, gene, value)
+        offspring.append(child)
+    return offspring
+
+
+def trait_distribution(genomes, gene):
+    """Count how many genomes carry each value of `gene`."""
+    offset, width = GENE_LAYOUT[gene]
+    mask = (1 << width) - 1
+    counts = [0] * GENE_CHOICES[gene]
+    for genome in genomes:
+        counts[(genome >> offset) & mask] += 1
+    return counts
+
+
+def genomes_value(genomes):
+    """Total base value of a population of genomes."""
+    return sum(genome_value(genome) for genome in genomes)
+
 # Define Upgrade class
 class Upgrade:
     def __init__(self, name, cost, level=0, max_level=5):
@@ -93,18 +589,28 @@ class Upgrade:
 
 # Define Fish class
 class Fish(pygame.sprite.Sprite):
-    def __init__(self, color, pattern, cosmetics=None, size_multiplier=1.0):
+    def __init__(self, color, pattern, cosmetics=None, size_multiplier=1.0, genome=None, rng=random):
         super().__init__()
         self.color = color
         self.pattern = pattern
-        self.base_value = fish_base_values.get(pattern, 1)  # Base value of the fish
+        if genome is None:
+            genome = pack_genome(color=FISH_COLORS.index(color),
+                                 pattern=FISH_PATTERNS.index(pattern),
+                                 **WILD_GENES)
+        self.genome = genome
+        self.base_value = genome_value(genome)  # Base value of the fish
         self.cosmetics = cosmetics if cosmetics else []
+        self.size_multiplier = size_multiplier
+        self.alpha = 255  # Below 255 while the fish fades in
+
+        # Size gene scales the fish on top of the player's multiplier
+        size_multiplier *= 0.7 + 0.1 * get_gene(genome, "size")
 
         # Colorize the base fish image
         self.base_image = colorize(fish_base_image, color)
 
         # Add patterns
-        self.add_pattern()
+        self.add_pattern(rng)
 
         # Apply size multiplier
         self.base_image = pygame.transform.scale(
@@ -115,12 +621,13 @@ class Fish(pygame.sprite.Sprite):
 
         # Set initial position
         self.rect = self.base_image.get_rect()
-        self.rect.x = random.randint(220, WIDTH - 320)  # Adjusted for sidebars
-        self.rect.y = random.randint(0, HEIGHT - self.rect.height)
+        self.rect.x = rng.randint(220, WIDTH - 320)  # Adjusted for sidebars
+        self.rect.y = rng.randint(0, HEIGHT - self.rect.height)
 
-        # Set velocity
-        self.dx = random.uniform(-3, 3)
-        self.dy = random.uniform(-3, 3)
+        # Set velocity (speed gene sets the top speed)
+        max_speed = 1 + 0.5 * get_gene(genome, "speed")
+        self.dx = rng.uniform(-max_speed, max_speed)
+        self.dy = rng.uniform(-max_speed, max_speed)
         # Ensure fish has some movement
         if self.dx == 0 and self.dy == 0:
             self.dx = 1
@@ -128,7 +635,26 @@ class Fish(pygame.sprite.Sprite):
         # Set initial image and angle
         self.update_image()
 
-    def add_pattern(self):
+    @classmethod
+    def from_genome(cls, genome, size_multiplier=1.0, rng=random):
+        """Build a fish sprite from a packed genome."""
+        fish = cls(FISH_COLORS[get_gene(genome, "color")],
+                   FISH_PATTERNS[get_gene(genome, "pattern")],
+                   size_multiplier=size_multiplier, genome=genome, rng=rng)
+        # Wear every cosmetic the genome carries
+        slots = get_gene(genome, "cosmetics")
+        for i, name in enumerate(COSMETIC_SLOTS):
+            if slots & (1 << i):
+                image = cosmetic_images[name]
+                fish.cosmetics.append({
+                    'image': image,
+                    'position': (fish.base_image.get_width() // 2 - image.get_width() // 2,
+                                 -image.get_height())  # Position above the fish
+                })
+        fish.update_image()
+        return fish
+
+    def add_pattern(self, rng=random):
         # Create a surface to draw patterns on
         pattern_surface = pygame.Surface(self.base_image.get_size(), pygame.SRCALPHA)
 
@@ -139,8 +665,8 @@ class Fish(pygame.sprite.Sprite):
         elif self.pattern == "spotted":
             # Draw spots
             for _ in range(5):
-                x = random.randint(0, self.base_image.get_width())
-                y = random.randint(0, self.base_image.get_height())
+                x = rng.randint(0, self.base_image.get_width())
+                y = rng.randint(0, self.base_image.get_height())
                 pygame.draw.circle(pattern_surface, BLACK, (x, y), 3)
         elif self.pattern == "glowing":
             # Draw a glow effect (simple representation)
@@ -161,6 +687,21 @@ class Fish(pygame.sprite.Sprite):
         self.base_image.blit(pattern_surface, (0, 0))
 
     def update(self):
+        self.move()
+
+        # Fade in newly spawned fish
+        if self.alpha < 255:
+            self.alpha = min(255, self.alpha + 15)
+
+        # Update image
+        self.update_image()
+
+    def finish_fade_in(self):
+        if self.alpha < 255:
+            self.alpha = 255
+            self.update_image()
+
+    def move(self):
         # Update position
         self.rect.x += self.dx
         self.rect.y += self.dy
@@ -179,9 +720,6 @@ class Fish(pygame.sprite.Sprite):
             self.dy *= -1
             self.rect.y += self.dy  # Move fish away from the wall
 
-        # Update image
-        self.update_image()
-
     def update_image(self):
         # Recalculate angle and rotate image
         self.angle = math.degrees(math.atan2(self.dy, self.dx)) + 90  # Adjusted angle
@@ -191,18 +729,26 @@ class Fish(pygame.sprite.Sprite):
         for cosmetic in self.cosmetics:
             self.image.blit(cosmetic['image'], cosmetic['position'])
 
+        if self.alpha < 255:
+            self.image.set_alpha(self.alpha)
+
         # Update rect to new image's rect, keeping the center position
         self.rect = self.image.get_rect(center=self.rect.center)
 
 # Define Player class
 class Player:
-    def __init__(self):
+    def __init__(self, context):
+        self.context = context
         self.level = 1
         self.experience = 0
         self.experience_needed = 10  # Experience needed for next level
-        self.collected_fish = []
+        self.collected_fish = array('Q')  # Genomes of every fish collected, never drawn
         self.stored_fish = []  # Fish kept in storage
-        self.tank_fish = []    # Fish in the tank
+        self.tank_fish = []    # Fish in the tank that have a sprite
+        # Genomes of every fish in the tank; the first len(tank_fish) match tank_fish
+        self.tank_genomes = array('Q')
+        # Fish the player moved into the tank sit at the front so they always have a sprite
+        self.tank_placed = 0
         self.coins = 0
         self.messages = []
         self.area_index = 0  # Index of the current area in the areas list
@@ -215,13 +761,30 @@ class Player:
             "Luck Upgrade": Upgrade("Luck Upgrade", cost=60),
         }
         self.cosmetics_inventory = []
-        self.auto_collect_timer = pygame.time.get_ticks()
+        self.auto_collect_timer = context.get_ticks()
         self.auto_collect_interval = 1000  # 1 second
         self.fish_size_multiplier = 1.0
         self.storage_capacity = 10  # Default storage capacity
         self.breeding_interval = 30000  # 30 seconds, can be decreased with upgrade
         self.luck_multiplier = 1.0  # Multiplier for storage chance
 
+    def __getstate__(self):
+        # The context is rebuilt on load, never saved
+        state = self.__dict__.copy()
+        state.pop('context', None)
+        # Cosmetic images can't be pickled, so only their names are saved
+        state['cosmetics_inventory'] = [cosmetic['name'] for cosmetic in self.cosmetics_inventory]
+        # Surfaces can't be pickled either, so stored fish are saved as genomes and
+        # rebuilt by Game.load_game; tank sprites come back from tank_genomes
+        state['stored_fish'] = [(fish.genome, fish.size_multiplier) for fish in self.stored_fish]
+        state['tank_fish'] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cosmetics_inventory = [{"name": name, "image": cosmetic_images[name]}
+                                    for name in self.cosmetics_inventory]
+
     def add_experience(self, amount):
         self.experience += amount
         while self.experience >= self.experience_needed:
@@ -242,7 +805,8 @@ class Player:
         self.coins += sell_value
         self.stored_fish.remove(fish)
         self.add_message(f"Sold a {fish.pattern} fish for {sell_value} coins!")
-        coin_sound.play()  # Play the coin sound effect when a fish is sold
+        self.context.emit(EVENT_SELL, sell_value, pattern=fish.pattern)
+        self.context.play_coin_sound()  # Play the coin sound effect when a fish is sold
 
     def can_upgrade(self, upgrade_name):
         upgrade = self.upgrades[upgrade_name]
@@ -254,41 +818,56 @@ class Player:
             self.coins -= int(upgrade.cost)
             upgrade.level += 1
             self.add_message(f"Purchased {upgrade_name} Upgrade Level {upgrade.level}!")
+            self.context.emit(EVENT_UPGRADE, int(upgrade.cost), upgrade=upgrade_name, level=upgrade.level)
             # Apply upgrade effects
             if upgrade_name == "Auto-Collector":
                 # Reduce interval by multiplying by a random factor between 0.65 and 0.75
-                factor = random.uniform(0.65, 0.75)
+                factor = self.context.rng.uniform(0.65, 0.75)
                 self.auto_collect_interval *= factor
                 self.auto_collect_interval = max(200, self.auto_collect_interval)
-                upgrade.cost *= random.uniform(1.65, 1.75)
+                upgrade.cost *= self.context.rng.uniform(1.65, 1.75)
             elif upgrade_name == "Bigger Fish":
                 self.fish_size_multiplier += 0.1
-                upgrade.cost *= random.uniform(1.65, 1.75)
+                upgrade.cost *= self.context.rng.uniform(1.65, 1.75)
             elif upgrade_name == "Increased Storage":
                 self.storage_capacity += 5
-                upgrade.cost *= random.uniform(1.65, 1.75)
+                upgrade.cost *= self.context.rng.uniform(1.65, 1.75)
             elif upgrade_name == "Increased Breeding":
-                factor = random.uniform(0.65, 0.75)
+                factor = self.context.rng.uniform(0.65, 0.75)
                 self.breeding_interval *= factor
                 self.breeding_interval = max(5000, self.breeding_interval)
-                upgrade.cost *= random.uniform(1.65, 1.75)
+                upgrade.cost *= self.context.rng.uniform(1.65, 1.75)
             elif upgrade_name == "Luck Upgrade":
                 self.luck_multiplier += 0.05
-                upgrade.cost *= random.uniform(1.65, 1.75)
+                upgrade.cost *= self.context.rng.uniform(1.65, 1.75)
         else:
             self.add_message("Cannot purchase upgrade.")
 
 # Define Game class
 class Game:
-    def __init__(self):
-        self.player = Player()
+    def __init__(self, context=None):
+        if context is None:
+            # Single-player game on the main window
+            context = GameContext(screen=screen, rng=random, telemetry=telemetry)
+        self.context = context
+        self.rng = context.rng
+        self.player = Player(context)
         self.all_fish = pygame.sprite.Group()
         self.running = True
+        # Expensive work is sliced across frames by the job scheduler
+        # Headless sessions run a fixed number of slices per tick so seeded runs reproduce
+        self.jobs = JobScheduler(slices_per_frame=5 if context.screen is None else None)
+        self.spawn_job = None
+        self.fill_tank_job = None
         self.areas = ["Pond", "Lake", "Stream", "River", "Ocean", "Tank"]  # Added "Tank"
         self.area = self.areas[self.player.area_index]
         self.load_game()  # Load game data if available
         self.spawn_fish()
 
+        # Total base value and pattern counts of the tank, kept up to date as fish come and go
+        self.tank_value = genomes_value(self.player.tank_genomes)
+        self.tank_patterns = trait_distribution(self.player.tank_genomes, "pattern")
+
         # Right sidebar dimensions
         self.sidebar_width = 220
 
@@ -296,7 +875,7 @@ class Game:
         self.world_map_rect = pygame.Rect(WIDTH - self.sidebar_width, HEIGHT - 220, self.sidebar_width, 220)
 
         # Breeding variables
-        self.last_breeding_time = pygame.time.get_ticks()
+        self.last_breeding_time = self.context.get_ticks()
 
         # Cosmetic items available
         self.cosmetics_shop = [
@@ -305,6 +884,12 @@ class Game:
         ]
 
     def spawn_fish(self):
+        # Replace any spawn still in progress (e.g. after an area change)
+        if self.spawn_job is not None and self.jobs.pending(self.spawn_job):
+            self.jobs.cancel(self.spawn_job)
+        self.spawn_job = self.jobs.add(self.spawn_fish_job(), PRIORITY_HIGH)
+
+    def spawn_fish_job(self):
         # Fish patterns available in each area
         area_patterns = {
             "Pond": ["plain"],
@@ -314,48 +899,55 @@ class Game:
             "Ocean": ["plain", "striped", "spotted", "glowing", "rainbow"],
         }
 
-        # Colors available
-        colors = [
-            pygame.Color("red"), pygame.Color("green"), pygame.Color("blue"),
-            pygame.Color("orange"), pygame.Color("pink"), pygame.Color("cyan"),
-            pygame.Color("magenta"), pygame.Color("brown"), pygame.Color("gray"),
-            pygame.Color("yellow"), pygame.Color("purple")
-        ]
-
         patterns = area_patterns.get(self.area, ["plain"])
 
         number_of_fish = 50  # Fish count
         for _ in range(number_of_fish):
-            color = random.choice(colors)
-            pattern = random.choice(patterns)
-            fish = Fish(color, pattern, size_multiplier=self.player.fish_size_multiplier)
+            color = self.rng.choice(FISH_COLORS)
+            pattern = self.rng.choice(patterns)
+            fish = Fish(color, pattern, size_multiplier=self.player.fish_size_multiplier, rng=self.rng)
+            # Fade the fish in instead of popping it onto the screen
+            fish.alpha = 0
+            fish.update_image()
             self.all_fish.add(fish)
+            yield
 
     def run(self):
         clock = pygame.time.Clock()
+        if self.context.telemetry is not None:
+            self.context.telemetry.start()
         while self.running:
             clock.tick(60)  # Limit to 60 FPS
+            # Record frames that took more than twice the 60 FPS budget
+            if clock.get_time() > 33:
+                self.context.emit(EVENT_FRAME_HITCH, clock.get_time(), area=self.area,
+                                  queue_depth=self.jobs.queue_depth())
             self.handle_events()
             self.update()
             self.draw()
         self.save_game()  # Save game data on exit
+        if self.context.telemetry is not None:
+            self.context.telemetry.close()
         pygame.quit()
         sys.exit()
 
     def auto_collect_fish(self):
         if len(self.all_fish) > 0:
-            fish = random.choice(self.all_fish.sprites())
-            self.player.collected_fish.append(fish)
+            fish = self.rng.choice(self.all_fish.sprites())
+            self.player.collected_fish.append(fish.genome)
             self.player.add_experience(1)  # Each fish gives 1 experience point
             self.player.coins += 1  # Player gets 1 coin per fish collected
             self.all_fish.remove(fish)
+            fish.finish_fade_in()  # Stored fish are never updated again
             self.player.add_message("Auto-collected a fish and earned 1 coin!")
+            self.context.emit(EVENT_COLLECT, 1, pattern=fish.pattern, auto=True)
 
             # Chance to store fish
-            if random.random() < 0.025 * self.player.luck_multiplier:
+            if self.rng.random() < 0.025 * self.player.luck_multiplier:
                 if len(self.player.stored_fish) < self.player.storage_capacity:
                     self.player.stored_fish.append(fish)
                     self.player.add_message(f"Stored a {fish.pattern} fish!")
+                    self.context.emit(EVENT_STORE, fish.base_value, pattern=fish.pattern)
                 else:
                     self.player.add_message("Storage is full!")
 
@@ -392,15 +984,17 @@ class Game:
                             30
                         )
                         if fish_rect.collidepoint(pos):
-                            self.player.stored_fish.remove(fish)
-                            self.player.tank_fish.append(fish)
-                            self.player.add_message(f"Moved {fish.pattern} fish to tank")
+                            if self.add_to_tank(fish):
+                                self.player.stored_fish.remove(fish)
+                                self.player.add_message(f"Moved {fish.pattern} fish to tank")
+                            else:
+                                self.player.add_message("Tank is full!")
                             break
 
                     # Move fish from tank to storage
                     for fish in self.player.tank_fish:
                         if fish.rect.collidepoint(pos):
-                            self.player.tank_fish.remove(fish)
+                            self.remove_from_tank(fish)
                             if len(self.player.stored_fish) < self.player.storage_capacity:
                                 self.player.stored_fish.append(fish)
                                 self.player.add_message(f"Moved {fish.pattern} fish to storage")
@@ -417,17 +1011,20 @@ class Game:
                     # Check for fish clicks
                     clicked_sprites = [s for s in self.all_fish if s.rect.collidepoint(pos)]
                     for fish in clicked_sprites:
-                        self.player.collected_fish.append(fish)
+                        self.player.collected_fish.append(fish.genome)
                         self.player.add_experience(1)  # Each fish gives 1 experience point
                         self.player.coins += 1  # Player gets 1 coin per fish tapped
                         self.all_fish.remove(fish)
+                        fish.finish_fade_in()  # Stored fish are never updated again
                         self.player.add_message(f"Collected a {fish.pattern} fish and earned 1 coin!")
+                        self.context.emit(EVENT_COLLECT, 1, pattern=fish.pattern, auto=False)
 
                         # Chance to store fish
-                        if random.random() < 0.025 * self.player.luck_multiplier:
+                        if self.rng.random() < 0.025 * self.player.luck_multiplier:
                             if len(self.player.stored_fish) < self.player.storage_capacity:
                                 self.player.stored_fish.append(fish)
                                 self.player.add_message(f"Stored a {fish.pattern} fish!")
+                                self.context.emit(EVENT_STORE, fish.base_value, pattern=fish.pattern)
                             else:
                                 self.player.add_message("Storage is full!")
 
@@ -449,6 +1046,7 @@ class Game:
 
     def open_area_shop(self):
         # Display the area shop using the world map image as background
+        screen, font, small_font = self.context.screen, self.context.font, self.context.small_font
         shop_running = True
         while shop_running:
             for event in pygame.event.get():
@@ -465,6 +1063,7 @@ class Game:
                                 self.player.area_index = i
                                 self.area = self.areas[self.player.area_index]
                                 self.player.add_message(f"Moved to {self.area}!")
+                                self.context.emit(EVENT_AREA_CHANGE, area=self.area)
                                 shop_running = False
                             elif area not in self.player.unlocked_areas:
                                 # Cost to unlock the area
@@ -473,12 +1072,14 @@ class Game:
                                     self.player.coins -= cost
                                     self.player.unlocked_areas.append(area)
                                     self.player.add_message(f"Unlocked {area}!")
+                                    self.context.emit(EVENT_UNLOCK, cost, area=area)
                                 else:
                                     self.player.add_message("Not enough coins!")
                             else:
                                 self.player.area_index = i
                                 self.area = self.areas[self.player.area_index]
                                 self.player.add_message(f"Moved to {self.area}!")
+                                self.context.emit(EVENT_AREA_CHANGE, area=self.area)
                                 self.all_fish.empty()
                                 self.spawn_fish()
                             shop_running = False
@@ -517,6 +1118,7 @@ class Game:
 
     def open_upgrade_shop(self):
         # Display the upgrade shop
+        screen, font, small_font = self.context.screen, self.context.font, self.context.small_font
         shop_running = True
         while shop_running:
             for event in pygame.event.get():
@@ -551,6 +1153,7 @@ class Game:
 
     def open_cosmetics_shop(self):
         # Display the cosmetics shop
+        screen, font, small_font = self.context.screen, self.context.font, self.context.small_font
         shop_running = True
         while shop_running:
             for event in pygame.event.get():
@@ -593,6 +1196,13 @@ class Game:
         if self.player.cosmetics_inventory:
             # For simplicity, apply the first cosmetic in the list
             cosmetic = self.player.cosmetics_inventory[0]
+            if cosmetic['name'] in COSMETIC_SLOTS:
+                # Record the cosmetic in the genome so babies can inherit it
+                slot = 1 << COSMETIC_SLOTS.index(cosmetic['name'])
+                fish.genome = set_gene(fish.genome, "cosmetics",
+                                       get_gene(fish.genome, "cosmetics") | slot)
+                if fish in self.player.tank_fish:
+                    self.player.tank_genomes[self.player.tank_fish.index(fish)] = fish.genome
             fish.cosmetics.append({
                 'image': cosmetic['image'],
                 'position': (fish.image.get_width() // 2 - cosmetic['image'].get_width() // 2,
@@ -603,54 +1213,104 @@ class Game:
         else:
             self.player.add_message("You have no cosmetics!")
 
+    def add_to_tank(self, fish):
+        # Tank genomes keep the sprite-backed fish at the front, with the
+        # player's own fish ahead of bred ones
+        index = self.player.tank_placed
+        if index >= TANK_VISIBLE_FISH:
+            return False
+        self.player.tank_genomes.insert(index, fish.genome)
+        self.player.tank_fish.insert(index, fish)
+        self.player.tank_placed += 1
+        if len(self.player.tank_fish) > TANK_VISIBLE_FISH:
+            # The last bred fish gives up its sprite but stays in the tank as a genome
+            self.player.tank_fish.pop()
+        self.tank_value += fish.base_value
+        self.tank_patterns[get_gene(fish.genome, "pattern")] += 1
+        return True
+
+    def remove_from_tank(self, fish):
+        index = self.player.tank_fish.index(fish)
+        del self.player.tank_fish[index]
+        del self.player.tank_genomes[index]
+        if index < self.player.tank_placed:
+            self.player.tank_placed -= 1
+        self.tank_value -= fish.base_value
+        self.tank_patterns[get_gene(fish.genome, "pattern")] -= 1
+        self.fill_tank_sprites()
+
+    def fill_tank_sprites(self):
+        if self.fill_tank_job is None or not self.jobs.pending(self.fill_tank_job):
+            self.fill_tank_job = self.jobs.add(self.fill_tank_sprites_job())
+
+    def fill_tank_sprites_job(self):
+        # Materialize sprites for genomes, one per slice, until the tank is visually full
+        while len(self.player.tank_fish) < min(len(self.player.tank_genomes), TANK_VISIBLE_FISH):
+            genome = self.player.tank_genomes[len(self.player.tank_fish)]
+            self.player.tank_fish.append(Fish.from_genome(genome, size_multiplier=self.player.fish_size_multiplier,
+                                                          rng=self.rng))
+            yield
+
     def breed_fish(self):
         # Breeding logic
-        if len(self.player.tank_fish) >= 2:
-            # Randomly select two parents
-            parent1, parent2 = random.sample(self.player.tank_fish, 2)
-            # Create baby fish with combined traits
-            baby_fish = self.create_baby_fish(parent1, parent2)
-            # Add baby fish to tank
-            self.player.tank_fish.append(baby_fish)
-            self.player.add_message("A new baby fish was born!")
-
-    def create_baby_fish(self, parent1, parent2):
-        # Combine traits
-        color = random.choice([parent1.color, parent2.color])
-        pattern = random.choice([parent1.pattern, parent2.pattern])
-        baby_fish = Fish(color, pattern, size_multiplier=self.player.fish_size_multiplier)
-        # Inherit cosmetics from parents (randomly)
-        inherited_cosmetics = random.choice([parent1.cosmetics, parent2.cosmetics])
-        baby_fish.cosmetics = [cosmetic.copy() for cosmetic in inherited_cosmetics]
-        # Position baby fish randomly in tank area
-        baby_fish.rect.x = random.randint(220, WIDTH - 320)
-        baby_fish.rect.y = random.randint(0, HEIGHT - baby_fish.rect.height)
-        return baby_fish
+        if len(self.player.tank_genomes) >= 2:
+            # Breed a whole batch of babies from random pairs at once,
+            # one more per level of the Increased Breeding upgrade
+            count = 1 + self.player.upgrades["Increased Breeding"].level
+            babies = breed_generation(self.player.tank_genomes, count, self.rng)
+            self.player.tank_genomes.extend(babies)
+            self.tank_value += genomes_value(babies)
+            for pattern, babies_with_pattern in enumerate(trait_distribution(babies, "pattern")):
+                self.tank_patterns[pattern] += babies_with_pattern
+            self.context.emit(EVENT_BREED, len(babies), tank_size=len(self.player.tank_genomes))
+            self.fill_tank_sprites()
+            if len(babies) == 1:
+                self.player.add_message("A new baby fish was born!")
+            else:
+                self.player.add_message(f"{len(babies)} baby fish were born!")
+
+    def update_fish(self, fishes):
+        if self.context.screen is None:
+            # Headless sessions never draw, so skip rotating the images
+            for fish in fishes:
+                fish.move()
+        else:
+            for fish in fishes:
+                fish.update()
 
     def update(self):
         # Auto-collector logic
         if self.player.upgrades["Auto-Collector"].level > 0:
-            current_time = pygame.time.get_ticks()
+            current_time = self.context.get_ticks()
             if current_time - self.player.auto_collect_timer >= self.player.auto_collect_interval:
                 self.auto_collect_fish()
                 self.player.auto_collect_timer = current_time
 
         if self.area == "Tank":
             # Update tank fish movement
-            for fish in self.player.tank_fish:
-                fish.update()
+            self.update_fish(self.player.tank_fish)
             # Implement breeding logic
-            current_time = pygame.time.get_ticks()
+            current_time = self.context.get_ticks()
             if current_time - self.last_breeding_time >= self.player.breeding_interval:
                 self.breed_fish()
                 self.last_breeding_time = current_time
         else:
             # Update fish movement
-            self.all_fish.update()
+            self.update_fish(self.all_fish)
+
+        # Run queued jobs within this frame's budget
+        elapsed = self.jobs.run()
+        if self.jobs.overran:
+            self.context.emit(EVENT_BUDGET_OVERRUN, round(elapsed, 2),
+                              queue_depth=self.jobs.queue_depth(), overruns=self.jobs.overruns)
 
     def draw(self):
+        screen, font, small_font = self.context.screen, self.context.font, self.context.small_font
+        if screen is None:
+            return  # Headless session
+
         # Draw the background image for the current area
-        screen.blit(background_images[self.area], (0, 0))
+        screen.blit(self.context.background_images[self.area], (0, 0))
 
         # Draw left sidebar background
         pygame.draw.rect(screen, (30, 30, 30, 180), (0, 0, 220, HEIGHT))
@@ -680,6 +1340,16 @@ class Game:
         if self.area == "Tank":
             for fish in self.player.tank_fish:
                 screen.blit(fish.image, fish.rect)
+            # Tank population stats
+            tank_text = small_font.render(
+                f"Tank: {len(self.player.tank_genomes)} fish, worth {self.tank_value * 5} coins",
+                True, WHITE)
+            screen.blit(tank_text, (230, 10))
+            patterns_text = small_font.render(
+                ", ".join(f"{FISH_PATTERNS[pattern]}: {count}"
+                          for pattern, count in enumerate(self.tank_patterns) if count),
+                True, WHITE)
+            screen.blit(patterns_text, (230, 35))
         else:
             self.all_fish.draw(screen)
 
@@ -718,20 +1388,32 @@ class Game:
             'area': self.area,
             'areas_unlocked': self.player.unlocked_areas,
         }
-        with open('savegame.pkl', 'wb') as f:
+        with open(self.context.save_path, 'wb') as f:
             pickle.dump(save_data, f)
 
     def load_game(self):
         # Load the game data from a file
-        if os.path.exists('savegame.pkl') and os.path.getsize('savegame.pkl') > 0:
+        if os.path.exists(self.context.save_path) and os.path.getsize(self.context.save_path) > 0:
             try:
-                with open('savegame.pkl', 'rb') as f:
+                with open(self.context.save_path, 'rb') as f:
                     save_data = pickle.load(f)
                     self.player = save_data['player']
                     self.area = save_data['area']
                     self.player.unlocked_areas = save_data['areas_unlocked']
-                    self.player.auto_collect_timer = pygame.time.get_ticks()
-                    self.last_breeding_time = pygame.time.get_ticks()
+                    self.player.context = self.context
+                    # Rebuild fish sprites with this session's RNG
+                    if not isinstance(self.player.collected_fish, array):
+                        # Older saves kept collected fish as a list of (genome, size) pairs
+                        self.player.collected_fish = array('Q', (genome for genome, size in self.player.collected_fish))
+                    self.player.stored_fish = self.rebuild_fish(self.player.stored_fish)
+                    self.fill_tank_sprites()
+                    if not hasattr(self.player, 'tank_genomes'):
+                        # Older saves could only be written with no fish, so the tank is empty
+                        self.player.tank_genomes = array('Q')
+                    if not hasattr(self.player, 'tank_placed'):
+                        self.player.tank_placed = 0
+                    self.player.auto_collect_timer = self.context.get_ticks()
+                    self.last_breeding_time = self.context.get_ticks()
                     self.player.add_message("Game Loaded!")
             except (EOFError, pickle.UnpicklingError):
                 # Handle empty or corrupted save file
@@ -740,14 +1422,100 @@ class Game:
         else:
             self.player.add_message("New Game Started!")
 
+    def rebuild_fish(self, saved_fish):
+        return [Fish.from_genome(genome, size_multiplier, rng=self.rng)
+                for genome, size_multiplier in saved_fish]
+
     def reset_game_data(self):
-        self.player = Player()
+        self.player = Player(self.context)
         self.area = self.areas[self.player.area_index]
         self.all_fish.empty()
         self.spawn_fish()
 
 
+# Define SessionHost class
+class SessionHost:
+    """Runs many independent headless games in one process on a shared tick scheduler.
+
+    Each session gets its own RNG, save file and simulated clock; the
+    images and fonts loaded at startup are shared by all of them.
+    """
+
+    def __init__(self, tick_rate=60, telemetry=None):
+        self.tick_ms = 1000 / tick_rate
+        self.now = 0.0  # Simulated milliseconds since the host started
+        self.telemetry = telemetry
+        self.sessions = {}  # Session id -> (game, bot)
+
+    def get_ticks(self):
+        return int(self.now)
+
+    def add_session(self, session_id, save_path, seed=None, bot=None):
+        context = GameContext(rng=random.Random(seed), get_ticks=self.get_ticks, save_path=save_path,
+                              telemetry=self.telemetry, session_id=session_id, sounds=False)
+        game = Game(context)
+        self.sessions[session_id] = (game, bot)
+        return game
+
+    def remove_session(self, session_id):
+        game, bot = self.sessions.pop(session_id)
+        game.save_game()
+
+    def step(self):
+        """Advance every session by one tick."""
+        self.now += self.tick_ms
+        for session_id, (game, bot) in list(self.sessions.items()):
+            if bot is not None:
+                bot(game)
+            game.update()
+            if not game.running:
+                self.remove_session(session_id)
+
+    async def run(self, ticks=None, realtime=True):
+        """Tick every session until they all stop or `ticks` ticks have passed."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        count = 0
+        while self.sessions and (ticks is None or count < ticks):
+            self.step()
+            count += 1
+            # Yield to other tasks, holding the tick rate in realtime mode
+            next_tick += self.tick_ms / 1000
+            await asyncio.sleep(max(0, next_tick - loop.time()) if realtime else 0)
+        for session_id in list(self.sessions):
+            self.remove_session(session_id)
+
+
+def soak_bot(game):
+    """Bot for soak tests: collects fish, sells them and buys upgrades at random."""
+    rng = game.rng
+    if rng.random() < 0.1:
+        game.auto_collect_fish()
+    if game.player.stored_fish and rng.random() < 0.01:
+        game.player.sell_fish(game.player.stored_fish[0])
+    if rng.random() < 0.001:
+        upgrade_name = rng.choice(list(game.player.upgrades))
+        if game.player.can_upgrade(upgrade_name):
+            game.player.purchase_upgrade(upgrade_name)
+
+
 # Start the game
-if __name__ == "__main__":
+if __name__ == "__main__" and "--sessions" in sys.argv:
+    # Soak test: python phish.py --sessions N [--ticks T]
+    session_count = int(sys.argv[sys.argv.index("--sessions") + 1])
+    ticks = int(sys.argv[sys.argv.index("--ticks") + 1]) if "--ticks" in sys.argv else 3600
+    os.makedirs('sessions', exist_ok=True)
+    host = SessionHost(telemetry=telemetry)
+    for i in range(session_count):
+        host.add_session(i, os.path.join('sessions', f'session_{i}.pkl'), seed=i, bot=soak_bot)
+    telemetry.start()
+    asyncio.run(host.run(ticks=ticks, realtime=False))
+    telemetry.close()
+    pygame.quit()
+elif __name__ == "__main__":
+    # Load background music
+    pygame.mixer.music.load(background_music_path)
+    pygame.mixer.music.play(-1)  # Play indefinitely
+
     game = Game()
     game.run()